@@ -2,6 +2,8 @@
 import os
 from flask import Flask
 from routes import register_routes
+from assets import register_assets
+from compression import register_compression
 from dotenv import load_dotenv
 
 # .envファイルから環境変数を読み込む
@@ -14,6 +16,8 @@ def create_app():
 
     # Register routes
     register_routes(app)
+    register_assets(app)
+    register_compression(app)
 
     return app
 
@@ -0,0 +1,91 @@
+"""Serving of fingerprinted, precompressed static assets built by build_assets.py."""
+import hashlib
+import json
+import mimetypes
+import os
+from typing import Dict, Optional, Tuple
+
+from flask import request, send_from_directory, url_for
+from werkzeug.exceptions import NotFound
+
+from config import Config
+
+# Precompressed variants in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def load_manifest() -> Dict[str, str]:
+    """Map source names to built names, skipping assets edited since the last build."""
+    manifest_path = Config.ASSET_DIST_DIR / 'manifest.json'
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+    assets = {}
+    for name, entry in manifest.items():
+        source_path = Config.basedir / 'static' / name
+        try:
+            current_hash = hashlib.sha256(source_path.read_bytes()).hexdigest()
+        except OSError:
+            continue
+        if current_hash != entry.get('source_hash'):
+            print(f"Warning: {name} changed since last asset build; run build_assets.py")
+            continue
+        assets[name] = entry['file']
+    return assets
+
+
+def register_assets(app):
+    """Register the /assets route and the ``asset_url`` template helper."""
+    manifest = load_manifest()
+    # Only fingerprinted files may be served with immutable caching
+    built_files = set(manifest.values())
+
+    @app.template_global()
+    def asset_url(filename: str) -> str:
+        """URL of the built asset for ``filename``, or the plain static file if not built."""
+        built = manifest.get(filename)
+        if built:
+            return url_for('built_asset', filename=built)
+        return url_for('static', filename=filename)
+
+    @app.route('/assets/<path:filename>')
+    def built_asset(filename):
+        """Serve a fingerprinted asset, precompressed when the client accepts it."""
+        if filename not in built_files:
+            raise NotFound()
+        encoding, suffix = _negotiate_encoding(filename)
+        response = send_from_directory(
+            Config.ASSET_DIST_DIR,
+            filename + suffix,
+            mimetype=mimetypes.guess_type(filename)[0],
+            max_age=Config.ASSET_MAX_AGE
+        )
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        # File names change with their content, so browsers never need to revalidate
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    return app
+
+
+def _negotiate_encoding(filename: str) -> Tuple[Optional[str], str]:
+    """Pick the best precompressed variant of ``filename`` the client accepts."""
+    for encoding, suffix in ENCODINGS:
+        if request.accept_encodings[encoding] and _dist_file_exists(filename + suffix):
+            return encoding, suffix
+    if not _dist_file_exists(filename):
+        raise NotFound()
+    return None, ''
+
+
+def _dist_file_exists(filename: str) -> bool:
+    """Whether ``filename`` exists inside the dist directory."""
+    path = os.path.normpath(Config.ASSET_DIST_DIR / filename)
+    if not path.startswith(str(Config.ASSET_DIST_DIR) + os.sep):
+        return False
+    return os.path.isfile(path)
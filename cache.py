@@ -0,0 +1,25 @@
+"""Last-good store for todo reads, used as a fallback during outages."""
+import threading
+from typing import Any, Dict, Optional
+
+
+class LastGoodCache:
+    """Remembers the most recent successful result of each read.
+
+    Nothing is served from here while Supabase is reachable; it only backs
+    the degraded responses returned when a read fails after retries.
+    """
+
+    def __init__(self):
+        self._last_good: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def remember(self, key: str, value: Any) -> None:
+        """Record a successful read as the fallback value."""
+        with self._lock:
+            self._last_good[key] = value
+
+    def get_last_good(self, key: str) -> Optional[Any]:
+        """Return the last successfully read value, however old, or None."""
+        with self._lock:
+            return self._last_good.get(key)
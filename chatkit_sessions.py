@@ -0,0 +1,154 @@
+"""ChatKit session creation with a per-device cache."""
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+from config import Config
+
+
+class ChatKitSessionError(Exception):
+    """Raised when the ChatKit sessions API rejects a request."""
+
+    def __init__(self, status_code: int, details: str):
+        super().__init__(f'Failed to create session: {status_code}')
+        self.status_code = status_code
+        self.details = details
+
+
+def generate_device_id() -> str:
+    """Generate a device id for clients that have not been assigned one yet."""
+    return f'todo_user_{uuid.uuid4().hex}'
+
+
+def create_upstream_session(device_id: str, workflow_id: str, api_key: str) -> Dict[str, Any]:
+    """Create a new session with the ChatKit sessions API."""
+    url = f"{Config.CHATKIT_API_BASE}/chatkit/sessions"
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {api_key}",
+        "OpenAI-Beta": "chatkit_beta=v1"
+    }
+    # ドキュメント通りのペイロード構造
+    payload = {
+        "workflow": {"id": workflow_id},
+        "user": device_id
+    }
+
+    response = requests.post(url, json=payload, headers=headers, timeout=Config.CHATKIT_REQUEST_TIMEOUT)
+    print(f"[ChatKit Session] Response status: {response.status_code}")
+
+    if response.status_code != 200:
+        raise ChatKitSessionError(response.status_code, response.text)
+    return response.json()
+
+
+class _InFlight:
+    """An upstream session request that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.session: Optional[Dict[str, Any]] = None
+        self.error: Optional[Exception] = None
+
+
+class ChatKitSessionCache:
+    """Cache of ChatKit sessions keyed by device id.
+
+    A session is reused until ``refresh_margin`` seconds before its
+    ``expires_at``. Concurrent requests for the same device share a single
+    upstream call.
+    """
+
+    def __init__(self, refresh_margin: float = None, default_ttl: float = None, max_size: int = None):
+        self.refresh_margin = Config.CHATKIT_SESSION_REFRESH_MARGIN if refresh_margin is None else refresh_margin
+        self.default_ttl = default_ttl or Config.CHATKIT_SESSION_DEFAULT_TTL
+        self.max_size = max_size or Config.CHATKIT_SESSION_CACHE_SIZE
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._expires: Dict[str, float] = {}
+        self._inflight: Dict[str, _InFlight] = {}
+        self._lock = threading.Lock()
+
+    def get_or_create(self, device_id: str, create: Callable[[], Dict[str, Any]],
+                      force_refresh: bool = False) -> Dict[str, Any]:
+        """Return a valid cached session for ``device_id`` or create one with ``create``.
+
+        ``force_refresh`` skips the cached session (e.g. when the client reports
+        its secret expired) but still joins a request already in flight.
+        """
+        with self._lock:
+            if not force_refresh:
+                session = self._get_valid(device_id)
+                if session is not None:
+                    return session
+
+            inflight = self._inflight.get(device_id)
+            leader = inflight is None
+            if leader:
+                inflight = _InFlight()
+                self._inflight[device_id] = inflight
+
+        if not leader:
+            inflight.done.wait()
+            if inflight.error is not None:
+                raise inflight.error
+            return inflight.session
+
+        try:
+            inflight.session = create()
+            self._store(device_id, inflight.session)
+            return inflight.session
+        except Exception as e:
+            inflight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[device_id]
+            inflight.done.set()
+
+    def invalidate(self, device_id: str) -> None:
+        """Forget the cached session for ``device_id``."""
+        with self._lock:
+            self._sessions.pop(device_id, None)
+            self._expires.pop(device_id, None)
+
+    def clear(self) -> None:
+        """Forget all cached sessions."""
+        with self._lock:
+            self._sessions.clear()
+            self._expires.clear()
+
+    def _get_valid(self, device_id: str) -> Optional[Dict[str, Any]]:
+        """Return the cached session if it is not about to expire (lock held)."""
+        expires_at = self._expires.get(device_id)
+        if expires_at is None:
+            return None
+        if time.time() >= expires_at - self.refresh_margin:
+            del self._sessions[device_id]
+            del self._expires[device_id]
+            return None
+        return self._sessions[device_id]
+
+    def _store(self, device_id: str, session: Dict[str, Any]) -> None:
+        """Cache a freshly created session, evicting expired or soonest-expiring entries."""
+        expires_at = session.get('expires_at')
+        if not isinstance(expires_at, (int, float)):
+            expires_at = time.time() + self.default_ttl
+
+        with self._lock:
+            now = time.time()
+            for key in [key for key, expiry in self._expires.items() if expiry - self.refresh_margin <= now]:
+                del self._sessions[key]
+                del self._expires[key]
+            while len(self._sessions) >= self.max_size:
+                soonest = min(self._expires, key=self._expires.get)
+                del self._sessions[soonest]
+                del self._expires[soonest]
+
+            self._sessions[device_id] = session
+            self._expires[device_id] = expires_at
+
+
+session_cache = ChatKitSessionCache()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Local stub of the OpenAI ChatKit sessions API for testing.
+
+Run it and point the app at it:
+
+    python chatkit_stub.py
+    export CHATKIT_API_BASE=http://127.0.0.1:5001/v1
+"""
+import threading
+import time
+import uuid
+
+from flask import Flask, jsonify, request
+
+
+def create_stub_app(session_ttl: int = 600, delay: float = 0.0) -> Flask:
+    """Create a Flask app that mimics POST /v1/chatkit/sessions.
+
+    Args:
+        session_ttl: Seconds until the returned sessions expire
+        delay: Seconds to wait before answering (to exercise concurrency)
+    """
+    app = Flask(__name__)
+    app.config['SESSIONS_CREATED'] = 0
+    lock = threading.Lock()
+
+    @app.route('/v1/chatkit/sessions', methods=['POST'])
+    def create_session():
+        """Return a fake session for the requested workflow and user."""
+        if not request.headers.get('Authorization', '').startswith('Bearer '):
+            return jsonify({'error': {'message': 'Missing API key'}}), 401
+
+        data = request.get_json(silent=True) or {}
+        workflow_id = (data.get('workflow') or {}).get('id')
+        user = data.get('user')
+        if not workflow_id or not user:
+            return jsonify({'error': {'message': 'workflow.id and user are required'}}), 400
+
+        if delay:
+            time.sleep(delay)
+
+        with lock:
+            app.config['SESSIONS_CREATED'] += 1
+
+        return jsonify({
+            'id': f'cksess_{uuid.uuid4().hex}',
+            'object': 'chatkit.session',
+            'client_secret': f'ek_stub_{uuid.uuid4().hex}',
+            'expires_at': int(time.time()) + session_ttl,
+            'workflow': {'id': workflow_id},
+            'user': user
+        })
+
+    @app.route('/stub/stats', methods=['GET'])
+    def stats():
+        """Number of sessions created so far."""
+        return jsonify({'sessions_created': app.config['SESSIONS_CREATED']})
+
+    return app
+
+
+if __name__ == '__main__':
+    create_stub_app().run(port=5001)
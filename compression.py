@@ -0,0 +1,39 @@
+"""Negotiated gzip/brotli compression of large dynamic responses."""
+import gzip
+
+from flask import request
+
+from config import Config
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # Fall back to gzip only
+
+
+def register_compression(app):
+    """Compress JSON and HTML responses when the client accepts it."""
+
+    @app.after_request
+    def compress_response(response):
+        if (response.direct_passthrough or response.is_streamed
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in Config.COMPRESS_MIMETYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        data = response.get_data()
+        if len(data) < Config.COMPRESS_MIN_SIZE:
+            return response
+
+        if brotli is not None and request.accept_encodings['br']:
+            # Low quality keeps per-request CPU cost close to gzip
+            response.set_data(brotli.compress(data, quality=4))
+            response.headers['Content-Encoding'] = 'br'
+        elif request.accept_encodings['gzip']:
+            response.set_data(gzip.compress(data, compresslevel=6))
+            response.headers['Content-Encoding'] = 'gzip'
+        return response
+
+    return app
@@ -26,6 +26,55 @@ class Config:
     # Debug mode (only for local development)
     DEBUG = not is_vercel
 
+    # Archive: completed todos older than this many days are moved to todos_archive
+    ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', '30'))
+    ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', '500'))
+    ARCHIVE_PAGE_SIZE = 20
+    ARCHIVE_MAX_PAGE_SIZE = 100
+
+    # Supabase call resilience (seconds)
+    # The HTTP client timeout is the smaller of the two, so a call abandoned at
+    # its deadline releases its worker thread at about the same time
+    SUPABASE_READ_DEADLINE = float(os.environ.get('SUPABASE_READ_DEADLINE', '3'))
+    SUPABASE_WRITE_DEADLINE = float(os.environ.get('SUPABASE_WRITE_DEADLINE', '3'))
+    SUPABASE_READ_ATTEMPTS = int(os.environ.get('SUPABASE_READ_ATTEMPTS', '3'))
+    SUPABASE_RETRY_BASE_DELAY = 0.1
+    SUPABASE_RETRY_MAX_DELAY = 1.0
+    # Start a duplicate read if the first has not answered after this long (unset disables)
+    SUPABASE_HEDGE_AFTER = float(os.environ['SUPABASE_HEDGE_AFTER']) if os.environ.get('SUPABASE_HEDGE_AFTER') else None
+    # Requests served at once by one process; the worker pool holds a thread for
+    # every attempt and hedge of each of them
+    SUPABASE_CONCURRENT_REQUESTS = int(os.environ.get('SUPABASE_CONCURRENT_REQUESTS', '4'))
+    SUPABASE_MAX_WORKERS = (
+        SUPABASE_CONCURRENT_REQUESTS
+        * SUPABASE_READ_ATTEMPTS
+        * (2 if SUPABASE_HEDGE_AFTER is not None else 1)
+    )
+
+    # ChatKit sessions (point CHATKIT_API_BASE at chatkit_stub.py for local testing)
+    CHATKIT_API_BASE = os.environ.get('CHATKIT_API_BASE', 'https://api.openai.com/v1').rstrip('/')
+    CHATKIT_REQUEST_TIMEOUT = 30
+    # Reuse a cached session until this many seconds before it expires
+    CHATKIT_SESSION_REFRESH_MARGIN = 60
+    # Lifetime assumed when the upstream response has no expires_at
+    CHATKIT_SESSION_DEFAULT_TTL = 600
+    CHATKIT_SESSION_CACHE_SIZE = 1000
+
+    # Static assets built by build_assets.py (served from /assets with immutable caching)
+    ASSET_SOURCES = ('js/app.js', 'js/chatkit.js', 'css/style.css')
+    ASSET_DIST_DIR = basedir / 'static' / 'dist'
+    ASSET_MAX_AGE = 31536000
+
+    # Responses smaller than this many bytes are sent uncompressed
+    COMPRESS_MIN_SIZE = 1024
+    COMPRESS_MIMETYPES = ('application/json', 'text/html')
+
+    # Bulk import/export
+    EXPORT_BATCH_SIZE = 1000
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', '1000'))
+    # Only this many row errors are reported back; the rest are just counted
+    IMPORT_MAX_REPORTED_ERRORS = 100
+
     @staticmethod
     def print_config(database_uri: str | None = None):
         """Print current configuration for debugging."""
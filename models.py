@@ -1,6 +1,11 @@
 """Database models and operations for the Todo application using Supabase."""
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+import httpx
+from postgrest.types import ReturnMethod
+from cache import LastGoodCache
+from config import Config
+from resilience import DeadlineExceeded, call_with_deadline, resilient_read
 from supabase_client import get_supabase_client
 
 
@@ -9,7 +14,8 @@ class Todo:
 
     def __init__(self, id: int = None, title: str = '', description: str = '',
                  completed: bool = False, priority: str = 'medium',
-                 order: int = 0, created_at: str = None, updated_at: str = None):
+                 order: int = 0, created_at: str = None, updated_at: str = None,
+                 archived_at: str = None):
         self.id = id
         self.title = title
         self.description = description
@@ -18,10 +24,11 @@ class Todo:
         self.order = order
         self.created_at = created_at or datetime.utcnow().isoformat()
         self.updated_at = updated_at or datetime.utcnow().isoformat()
+        self.archived_at = archived_at
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert Todo object to dictionary."""
-        return {
+        data = {
             'id': self.id,
             'title': self.title,
             'description': self.description,
@@ -31,6 +38,10 @@ class Todo:
             'created_at': self.created_at,
             'updated_at': self.updated_at
         }
+        # Only archived todos carry an archive timestamp
+        if self.archived_at:
+            data['archived_at'] = self.archived_at
+        return data
 
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> 'Todo':
@@ -43,7 +54,8 @@ class Todo:
             priority=data.get('priority', 'medium'),
             order=data.get('order', 0),
             created_at=data.get('created_at'),
-            updated_at=data.get('updated_at')
+            updated_at=data.get('updated_at'),
+            archived_at=data.get('archived_at')
         )
 
     def __repr__(self):
@@ -51,19 +63,71 @@ class Todo:
         return f'<Todo {self.id}: {self.title}>'
 
 
+class TodoList(list):
+    """List of todos that records whether it was served from a stale cache.
+
+    ``degraded`` is True when Supabase could not be reached and the last good
+    result was returned instead of a fresh one.
+    """
+
+    def __init__(self, todos=(), degraded: bool = False):
+        super().__init__(todos)
+        self.degraded = degraded
+
+
+PRIORITIES = ('high', 'medium', 'low')
+
+# Last good list/stats results, served (marked degraded) only when Supabase is unreachable
+todo_cache = LastGoodCache()
+
+
+class DataUnavailable(Exception):
+    """Raised when a read still fails after retries, as opposed to finding no row."""
+
+
+class WriteOutcomeUnknown(Exception):
+    """Raised when a write timed out; it may or may not have been committed."""
+
+
+class ArchiveIncomplete(Exception):
+    """Raised when an archive run fails partway; ``archived`` rows were already moved."""
+
+    def __init__(self, archived: int):
+        super().__init__(f"Archiving failed after moving {archived} todos")
+        self.archived = archived
+
+
+def _write(fn):
+    """Run a write under its deadline.
+
+    A timed-out write can still commit, so timeouts are raised as
+    WriteOutcomeUnknown instead of being reported as a plain failure.
+    """
+    try:
+        return call_with_deadline(fn)
+    except (DeadlineExceeded, httpx.TimeoutException) as e:
+        raise WriteOutcomeUnknown(str(e)) from e
+
+
 class TodoRepository:
     """Repository for Todo database operations using Supabase."""
 
     @staticmethod
-    def get_all_todos_ordered() -> List[Todo]:
-        """Get all todos ordered by priority, order, and creation date."""
+    def get_all_todos_ordered() -> Optional[TodoList]:
+        """Get all todos ordered by priority, order, and creation date.
+
+        If Supabase cannot be reached the last good list is returned marked as
+        degraded; None is returned when there is nothing to fall back to.
+        """
         try:
             supabase = get_supabase_client()
 
             # Fetch all todos and sort in Python since Supabase doesn't support custom SQL expressions easily
-            response = supabase.table('todos').select('*').order('created_at', desc=True).execute()
+            response = resilient_read(
+                lambda: supabase.table('todos').select('*').order('created_at', desc=True).execute()
+            )
 
-            todos = [Todo.from_dict(item) for item in response.data]
+            todos = TodoList(Todo.from_dict(item) for item in response.data)
 
             # Custom sorting: priority (high=3, medium=2, low=1), then order, then created_at
             priority_map = {'high': 3, 'medium': 2, 'low': 1}
@@ -76,24 +140,51 @@ class TodoRepository:
                 reverse=False
             )
 
+            todo_cache.remember('todos', todos)
             return todos
         except Exception as e:
             print(f"Error fetching todos: {e}")
-            return []
+            last_good = todo_cache.get_last_good('todos')
+            if last_good is None:
+                return None
+            return TodoList(last_good, degraded=True)
 
     @staticmethod
     def get_todo_by_id(todo_id: int) -> Optional[Todo]:
-        """Get a specific todo by ID."""
+        """Get a specific todo by ID.
+
+        Returns None when no such todo exists; raises DataUnavailable when
+        Supabase cannot be reached.
+        """
         try:
             supabase = get_supabase_client()
-            response = supabase.table('todos').select('*').eq('id', todo_id).single().execute()
-
-            if response.data:
-                return Todo.from_dict(response.data)
-            return None
+            response = resilient_read(
+                lambda: supabase.table('todos').select('*').eq('id', todo_id).limit(1).execute()
+            )
         except Exception as e:
             print(f"Error fetching todo {todo_id}: {e}")
-            return None
+            raise DataUnavailable(f"Could not fetch todo {todo_id}") from e
+
+        if response.data:
+            return Todo.from_dict(response.data[0])
+        return None
+
+    @staticmethod
+    def get_max_order() -> int:
+        """Get the highest ``order`` value in use (0 when there are no todos).
+
+        Raises DataUnavailable on failure so bulk callers do not silently
+        restart numbering.
+        """
+        try:
+            supabase = get_supabase_client()
+            response = resilient_read(
+                lambda: supabase.table('todos').select('order').order('order', desc=True).limit(1).execute()
+            )
+        except Exception as e:
+            print(f"Error fetching max order: {e}")
+            raise DataUnavailable("Could not fetch max order") from e
+        return response.data[0]['order'] if response.data else 0
 
     @staticmethod
     def create_todo(title: str, description: str = '', priority: str = 'medium') -> Optional[Todo]:
@@ -105,8 +196,7 @@ class TodoRepository:
 
             # Get max order
             try:
-                max_order_response = supabase.table('todos').select('order').order('order', desc=True).limit(1).execute()
-                max_order = max_order_response.data[0]['order'] if max_order_response.data else 0
+                max_order = TodoRepository.get_max_order()
                 print(f"[DEBUG] Max order: {max_order}")
             except Exception as order_error:
                 print(f"[DEBUG] Error getting max order (using 0): {order_error}")
@@ -122,7 +212,7 @@ class TodoRepository:
             }
             print(f"[DEBUG] Todo data: {todo_data}")
 
-            response = supabase.table('todos').insert(todo_data).execute()
+            response = _write(lambda: supabase.table('todos').insert(todo_data).execute())
             print(f"[DEBUG] Insert response data: {response.data}")
             print(f"[DEBUG] Insert response status: {hasattr(response, 'status_code') and response.status_code}")
 
@@ -131,12 +221,63 @@ class TodoRepository:
                 return Todo.from_dict(response.data[0])
             print(f"[DEBUG] No data in response. Full response: {response}")
             return None
+        except WriteOutcomeUnknown:
+            raise
         except Exception as e:
             print(f"[ERROR] Error creating todo: {type(e).__name__}: {e}")
             import traceback
             print(f"[ERROR] Traceback:\n{traceback.format_exc()}")
             return None
 
+    @staticmethod
+    def insert_todos(todo_rows: List[Dict[str, Any]]) -> int:
+        """Insert a batch of todos in a single request.
+
+        Returns the number of todos inserted (0 on failure); raises
+        WriteOutcomeUnknown if the insert timed out.
+        """
+        if not todo_rows:
+            return 0
+        try:
+            supabase = get_supabase_client()
+            # Minimal return skips echoing every inserted row back to us
+            _write(
+                lambda: supabase.table('todos').insert(todo_rows, returning=ReturnMethod.minimal).execute()
+            )
+            return len(todo_rows)
+        except WriteOutcomeUnknown:
+            raise
+        except Exception as e:
+            print(f"Error inserting batch of {len(todo_rows)} todos: {e}")
+            return 0
+
+    @staticmethod
+    def iter_todos(batch_size: int = None) -> Iterator[Todo]:
+        """Iterate over all todos in id order, fetching ``batch_size`` rows at a time.
+
+        Uses keyset pagination so memory stays bounded however many todos
+        exist. Unlike the other reads this raises on failure, so a streamed
+        export is cut off visibly instead of looking complete.
+        """
+        batch_size = batch_size or Config.EXPORT_BATCH_SIZE
+        supabase = get_supabase_client()
+        last_id = 0
+
+        while True:
+            response = resilient_read(
+                lambda: supabase.table('todos').select('*')
+                .gt('id', last_id)
+                .order('id')
+                .limit(batch_size)
+                .execute()
+            )
+            # Stop only on an empty page: PostgREST max-rows may cap pages below batch_size
+            if not response.data:
+                return
+            for item in response.data:
+                yield Todo.from_dict(item)
+            last_id = response.data[-1]['id']
+
     @staticmethod
     def update_todo(todo_id: int, **kwargs) -> Optional[Todo]:
         """Update an existing todo."""
@@ -157,11 +298,15 @@ class TodoRepository:
             # Update timestamp
             update_data['updated_at'] = datetime.utcnow().isoformat()
 
-            response = supabase.table('todos').update(update_data).eq('id', todo_id).execute()
+            response = _write(
+                lambda: supabase.table('todos').update(update_data).eq('id', todo_id).execute()
+            )
 
             if response.data:
                 return Todo.from_dict(response.data[0])
             return None
+        except (DataUnavailable, WriteOutcomeUnknown):
+            raise
         except Exception as e:
             print(f"Error updating todo {todo_id}: {e}")
             return None
@@ -171,8 +316,10 @@ class TodoRepository:
         """Delete a todo."""
         try:
             supabase = get_supabase_client()
-            supabase.table('todos').delete().eq('id', todo_id).execute()
+            _write(lambda: supabase.table('todos').delete().eq('id', todo_id).execute())
             return True
+        except WriteOutcomeUnknown:
+            raise
         except Exception as e:
             print(f"Error deleting todo {todo_id}: {e}")
             return False
@@ -185,6 +332,8 @@ class TodoRepository:
             if todo:
                 return TodoRepository.update_todo(todo_id, completed=not todo.completed)
             return None
+        except (DataUnavailable, WriteOutcomeUnknown):
+            raise
         except Exception as e:
             print(f"Error toggling todo {todo_id}: {e}")
             return None
@@ -199,16 +348,164 @@ class TodoRepository:
                 if 'id' not in item or 'order' not in item:
                     continue
 
-                supabase.table('todos').update({
+                _write(lambda: supabase.table('todos').update({
                     'order': item['order'],
                     'updated_at': datetime.utcnow().isoformat()
-                }).eq('id', item['id']).execute()
+                }).eq('id', item['id']).execute())
 
             return True
+        except WriteOutcomeUnknown:
+            raise
         except Exception as e:
             print(f"Error reordering todos: {e}")
             return False
 
+    @staticmethod
+    def archive_completed_todos(older_than_days: int = None, batch_size: int = None) -> int:
+        """Move todos completed more than ``older_than_days`` ago into todos_archive.
+
+        Each batch is moved by the ``archive_completed_todos_batch`` database
+        function in a single DELETE ... RETURNING / INSERT statement, so a todo
+        edited or un-completed mid-run is never archived or duplicated.
+        ``updated_at`` is used as the completion time since the trigger bumps
+        it whenever a todo is toggled.
+
+        Returns the number of todos archived. Raises WriteOutcomeUnknown if a
+        batch timed out and ArchiveIncomplete on any other failure; earlier
+        batches stay archived and the run can simply be repeated.
+        """
+        if older_than_days is None:
+            older_than_days = Config.ARCHIVE_AFTER_DAYS
+        batch_size = batch_size or Config.ARCHIVE_BATCH_SIZE
+        cutoff = (datetime.utcnow() - timedelta(days=older_than_days)).isoformat()
+
+        archived = 0
+        try:
+            supabase = get_supabase_client()
+
+            while True:
+                response = _write(
+                    lambda: supabase.rpc('archive_completed_todos_batch', {
+                        'p_cutoff': cutoff,
+                        'p_batch_size': batch_size
+                    }).execute()
+                )
+                moved = response.data or 0
+                archived += moved
+                if moved < batch_size:
+                    break
+
+            return archived
+        except WriteOutcomeUnknown:
+            raise
+        except Exception as e:
+            print(f"Error archiving todos (archived {archived} before failure): {e}")
+            raise ArchiveIncomplete(archived) from e
+
+    @staticmethod
+    def get_archived_todos(cursor: Optional[Tuple[str, int]] = None,
+                           per_page: int = None) -> Tuple[List[Todo], Optional[Tuple[str, int]]]:
+        """Get a page of archived todos, most recently archived first.
+
+        Pages are keyed on ``(archived_at, id)``: pass the cursor returned for
+        the previous page to get the next one. The returned cursor is None on
+        the last page. Raises DataUnavailable when Supabase cannot be reached.
+        """
+        per_page = per_page or Config.ARCHIVE_PAGE_SIZE
+        try:
+            supabase = get_supabase_client()
+
+            def query():
+                builder = supabase.table('todos_archive').select('*') \
+                    .order('archived_at', desc=True) \
+                    .order('id', desc=True) \
+                    .limit(per_page + 1)
+                if cursor is not None:
+                    archived_at, last_id = cursor
+                    builder = builder.or_(
+                        f'archived_at.lt."{archived_at}",'
+                        f'and(archived_at.eq."{archived_at}",id.lt.{last_id})'
+                    )
+                return builder.execute()
+
+            response = resilient_read(query)
+
+            # One extra row tells us whether another page exists
+            rows = response.data[:per_page]
+            next_cursor = None
+            if len(response.data) > per_page:
+                next_cursor = (rows[-1]['archived_at'], rows[-1]['id'])
+            return [Todo.from_dict(item) for item in rows], next_cursor
+        except Exception as e:
+            print(f"Error fetching archived todos: {e}")
+            raise DataUnavailable("Could not fetch archived todos") from e
+
+    @staticmethod
+    def restore_todo(todo_id: int) -> Optional[Todo]:
+        """Move an archived todo back into the hot table.
+
+        Uses the ``restore_archived_todo`` database function, which deletes the
+        archive row and inserts it into ``todos`` in one statement. Returns None
+        when no such archived todo exists; raises DataUnavailable when Supabase
+        cannot be reached.
+        """
+        try:
+            supabase = get_supabase_client()
+            response = _write(
+                lambda: supabase.rpc('restore_archived_todo', {'p_id': todo_id}).execute()
+            )
+
+            if response.data:
+                return Todo.from_dict(response.data[0])
+            return None
+        except WriteOutcomeUnknown:
+            raise
+        except Exception as e:
+            print(f"Error restoring todo {todo_id}: {e}")
+            raise DataUnavailable(f"Could not restore todo {todo_id}") from e
+
+    @staticmethod
+    def get_todo_stats() -> Optional[Dict[str, Any]]:
+        """Get todo counts by completion status and priority.
+
+        Counts come from the ``todo_stats`` summary table, which triggers keep
+        in sync with ``todos``, so this reads a handful of rows regardless of
+        how many todos exist. If Supabase cannot be reached the last good
+        counts are returned with ``degraded`` set.
+        """
+        try:
+            supabase = get_supabase_client()
+            response = resilient_read(
+                lambda: supabase.table('todo_stats').select('completed, priority, count').execute()
+            )
+
+            by_priority = {
+                priority: {'total': 0, 'completed': 0, 'active': 0}
+                for priority in PRIORITIES
+            }
+            for row in response.data:
+                counts = by_priority.setdefault(row['priority'], {'total': 0, 'completed': 0, 'active': 0})
+                status = 'completed' if row['completed'] else 'active'
+                counts[status] += row['count']
+                counts['total'] += row['count']
+
+            stats = {
+                'total': sum(counts['total'] for counts in by_priority.values()),
+                'completed': sum(counts['completed'] for counts in by_priority.values()),
+                'active': sum(counts['active'] for counts in by_priority.values()),
+                'by_priority': by_priority,
+                'degraded': False
+            }
+
+            todo_cache.remember('stats', stats)
+            return stats
+        except Exception as e:
+            print(f"Error fetching todo stats: {e}")
+            last_good = todo_cache.get_last_good('stats')
+            if last_good is None:
+                return None
+            return {**last_good, 'degraded': True}
+
 
 # For backward compatibility (if needed for initialization)
 db = None
@@ -0,0 +1,178 @@
+"""Deadlines, retries and hedged reads around Supabase calls."""
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Optional, TypeVar
+
+import httpx
+from postgrest.exceptions import APIError
+
+from config import Config
+
+T = TypeVar('T')
+
+# Calls run on worker threads so a hung request can be abandoned at its deadline.
+# Sized in Config for every attempt and hedge of each concurrent request.
+_executor = ThreadPoolExecutor(
+    max_workers=Config.SUPABASE_MAX_WORKERS,
+    thread_name_prefix='supabase'
+)
+
+# Indirection so tests can skip real backoff sleeps
+_sleep = time.sleep
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a Supabase call does not finish within its deadline."""
+
+
+class _Call:
+    """A call submitted to the pool that records when it actually started running."""
+
+    def __init__(self, fn: Callable[[], T]):
+        self.started = threading.Event()
+        self.started_at: Optional[float] = None
+        self.future: Future = _executor.submit(self._run, fn)
+
+    def _run(self, fn: Callable[[], T]) -> T:
+        self.started_at = time.monotonic()
+        self.started.set()
+        return fn()
+
+    def wait_started(self, timeout: float) -> float:
+        """Block until a worker picks the call up; return its start time.
+
+        Raises DeadlineExceeded if no worker is free within ``timeout``
+        seconds. The queued call is cancelled, so it never runs.
+        """
+        if not self.started.wait(timeout) and self.future.cancel():
+            raise DeadlineExceeded(f"No Supabase worker free within {timeout:.1f}s")
+        # cancel() fails once a worker has taken the call, so it is starting now
+        self.started.wait()
+        return self.started_at
+
+
+def call_with_deadline(fn: Callable[[], T], deadline: float = None) -> T:
+    """Run ``fn`` and raise DeadlineExceeded if it runs longer than ``deadline`` seconds.
+
+    The deadline is measured from when a worker starts the call, so time
+    spent queued behind other calls does not count against it; the queue
+    wait itself is bounded by the same deadline.
+    """
+    deadline = Config.SUPABASE_WRITE_DEADLINE if deadline is None else deadline
+    call = _Call(fn)
+    started = call.wait_started(deadline)
+    done, _ = wait([call.future], timeout=max(deadline - (time.monotonic() - started), 0))
+    if not done:
+        raise DeadlineExceeded(f"Supabase call exceeded {deadline:.1f}s deadline")
+    return call.future.result()
+
+
+def _hedged_call(fn: Callable[[], T], deadline: float, hedge_after: Optional[float]) -> T:
+    """Run ``fn`` once, starting a duplicate if it is still running after ``hedge_after``.
+
+    Both the deadline and the hedge delay are measured from when the first
+    copy starts running (waiting for it to start is bounded by the deadline
+    too). The first successful result wins; an error is only raised once
+    every in-flight copy has failed or the deadline has passed.
+    """
+    primary = _Call(fn)
+    started = primary.wait_started(deadline)
+    pending = {primary.future}
+    hedged = hedge_after is None or hedge_after >= deadline
+
+    while pending:
+        elapsed = time.monotonic() - started
+        remaining = deadline - elapsed
+        if remaining <= 0:
+            break
+        wait_for = remaining if hedged else min(remaining, hedge_after - elapsed)
+        done, pending = wait(pending, timeout=max(wait_for, 0), return_when=FIRST_COMPLETED)
+
+        error = None
+        for future in done:
+            if future.exception() is None:
+                for other in pending:
+                    other.cancel()
+                return future.result()
+            error = future.exception()
+
+        if not pending:
+            raise error
+
+        if not hedged and time.monotonic() - started >= hedge_after:
+            pending.add(_Call(fn).future)
+            hedged = True
+
+    for future in pending:
+        future.cancel()
+    raise DeadlineExceeded(f"Supabase read exceeded {deadline:.1f}s deadline")
+
+
+# SQLSTATE classes PostgREST reports as 5xx because the database was briefly
+# unable to answer: connection exceptions, insufficient resources, operator
+# intervention (e.g. statement timeout, shutdown) and system errors.
+# PGRST000-PGRST003 are PostgREST's own connection and pool timeout errors.
+_TRANSIENT_ERROR_CODES = ('08', '53', '57', '58', 'PGRST000', 'PGRST001', 'PGRST002', 'PGRST003')
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether a failed read may succeed if simply tried again.
+
+    Deadlines, network/transport failures (including httpx timeouts) and
+    server-side 5xx errors are transient. Anything else - bad requests,
+    permission or constraint errors, bugs - fails the same way every time.
+    """
+    if isinstance(error, (DeadlineExceeded, httpx.TransportError)):
+        return True
+    if isinstance(error, APIError):
+        code = error.code
+        # Non-JSON error bodies (e.g. a gateway's 502 page) carry the HTTP status
+        if isinstance(code, int) or (isinstance(code, str) and code.isdigit() and len(code) == 3):
+            return int(code) >= 500
+        return isinstance(code, str) and code.startswith(_TRANSIENT_ERROR_CODES)
+    return False
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter delay before retry number ``attempt + 1``.
+
+    A random amount between 0 and the exponential backoff for ``attempt``,
+    capped at SUPABASE_RETRY_MAX_DELAY.
+    """
+    backoff = min(Config.SUPABASE_RETRY_MAX_DELAY, Config.SUPABASE_RETRY_BASE_DELAY * (2 ** attempt))
+    return random.uniform(0, backoff)
+
+
+def resilient_read(fn: Callable[[], T], deadline: float = None, attempts: int = None,
+                   hedge_after: Optional[float] = None) -> T:
+    """Run an idempotent read with a per-attempt deadline and jittered retries.
+
+    Args:
+        fn: Zero-argument callable that builds and executes the query
+        deadline: Seconds allowed per attempt
+        attempts: Maximum number of attempts
+        hedge_after: Start a duplicate read after this many seconds (None uses Config)
+
+    Returns:
+        The result of the first successful attempt
+
+    Raises:
+        The first non-transient error, or the last error once all attempts
+        have failed
+    """
+    deadline = Config.SUPABASE_READ_DEADLINE if deadline is None else deadline
+    attempts = attempts or Config.SUPABASE_READ_ATTEMPTS
+    if hedge_after is None:
+        hedge_after = Config.SUPABASE_HEDGE_AFTER
+
+    for attempt in range(attempts):
+        try:
+            return _hedged_call(fn, deadline, hedge_after)
+        except Exception as e:
+            if attempt == attempts - 1 or not is_transient(e):
+                raise
+            delay = backoff_delay(attempt)
+            print(f"Supabase read failed (attempt {attempt + 1}/{attempts}), retrying in {delay:.2f}s: {e}")
+            _sleep(delay)
@@ -1,18 +1,66 @@
 """API routes for the Todo application."""
+import base64
+import binascii
+import itertools
+import json
 import os
-from flask import render_template, request, jsonify
-from models import TodoRepository
+from datetime import datetime
+from flask import Response, render_template, request, jsonify, stream_with_context
+from config import Config
+from models import ArchiveIncomplete, DataUnavailable, TodoRepository, WriteOutcomeUnknown
 from ai_service import generate_description
+from todo_io import FORMATS, export_csv, export_ndjson, import_todos, parse_csv, parse_ndjson
+from chatkit_sessions import ChatKitSessionError, create_upstream_session, generate_device_id, session_cache
+
+
+# Reason an import stopped early -> (message, status)
+IMPORT_ABORT_ERRORS = {
+    'invalid_encoding': ("Upload must be UTF-8 encoded; 'imported' counts rows saved before the bad data", 400),
+    'invalid_csv': ("Upload is not valid CSV; 'imported' counts rows saved before the bad data", 400),
+    'insert_failed': ('Failed to insert todos; import stopped', 500),
+    'outcome_unknown': ('The database did not respond in time; the last batch may or may not have been saved', 504)
+}
+
+
+def _encode_cursor(cursor):
+    """Encode an ``(archived_at, id)`` archive cursor as an opaque URL-safe string."""
+    return base64.urlsafe_b64encode(json.dumps(list(cursor)).encode('utf-8')).decode('ascii')
+
+
+def _decode_cursor(value):
+    """Decode a cursor from ``_encode_cursor``; raises ValueError if it is malformed."""
+    try:
+        archived_at, last_id = json.loads(base64.urlsafe_b64decode(value.encode('ascii')))
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as e:
+        raise ValueError('Invalid cursor') from e
+    if not isinstance(archived_at, str) or not isinstance(last_id, int):
+        raise ValueError('Invalid cursor')
+    # Must be a real timestamp: it is interpolated into the PostgREST filter
+    datetime.fromisoformat(archived_at)
+    return archived_at, last_id
 
 
 def register_routes(app):
     """Register all routes with the Flask app."""
 
+    @app.errorhandler(DataUnavailable)
+    def data_unavailable(e):
+        """Supabase could not be reached even after retries."""
+        return jsonify({'error': 'Todos are temporarily unavailable'}), 503
+
+    @app.errorhandler(WriteOutcomeUnknown)
+    def write_outcome_unknown(e):
+        """A write timed out and may or may not have been saved."""
+        return jsonify({
+            'error': 'The database did not respond in time; the change may or may not have been saved'
+        }), 504
+
     @app.route('/')
     def index():
         """Render the main page."""
         todos = TodoRepository.get_all_todos_ordered()
-        return render_template('index.html', todos=todos)
+        degraded = todos is None or todos.degraded
+        return render_template('index.html', todos=todos or [], degraded=degraded)
 
     @app.route('/api/debug/env', methods=['GET'])
     def debug_env():
@@ -33,7 +81,82 @@ def register_routes(app):
     def get_todos():
         """Get all todos."""
         todos = TodoRepository.get_all_todos_ordered()
-        return jsonify([todo.to_dict() for todo in todos])
+        if todos is None:
+            return jsonify({'error': 'Todos are temporarily unavailable'}), 503
+
+        response = jsonify([todo.to_dict() for todo in todos])
+        if todos.degraded:
+            # Served from the last good read because Supabase is unreachable
+            response.headers['X-Data-Degraded'] = 'stale'
+        return response
+
+    @app.route('/api/todos/stats', methods=['GET'])
+    def get_todo_stats():
+        """Get todo counts by status and priority."""
+        stats = TodoRepository.get_todo_stats()
+        if stats is None:
+            return jsonify({'error': 'Stats are temporarily unavailable'}), 503
+
+        response = jsonify(stats)
+        if stats['degraded']:
+            response.headers['X-Data-Degraded'] = 'stale'
+        # Content-based ETag: clients revalidate every time but only get a body when counts change
+        response.cache_control.no_cache = True
+        response.add_etag()
+        return response.make_conditional(request)
+
+    @app.route('/api/todos/export', methods=['GET'])
+    def export_todos():
+        """Stream all todos as NDJSON (default) or CSV."""
+        export_format = request.args.get('format', 'ndjson')
+        if export_format not in FORMATS:
+            return jsonify({'error': f"format must be one of: {', '.join(FORMATS)}"}), 400
+
+        todos = TodoRepository.iter_todos()
+        try:
+            # Fetch the first page up front so an outage is reported as an error, not an empty file
+            first = next(todos, None)
+        except Exception as e:
+            print(f"Error exporting todos: {e}")
+            return jsonify({'error': 'Todos are temporarily unavailable'}), 503
+        if first is not None:
+            todos = itertools.chain([first], todos)
+
+        serialize = export_csv if export_format == 'csv' else export_ndjson
+        response = Response(stream_with_context(serialize(todos)), mimetype=FORMATS[export_format])
+        response.headers['Content-Disposition'] = f'attachment; filename=todos.{export_format}'
+        return response
+
+    @app.route('/api/todos/import', methods=['POST'])
+    def import_todos_upload():
+        """Import todos from an NDJSON or CSV upload (raw body or multipart ``file``)."""
+        try:
+            if request.mimetype == 'multipart/form-data':
+                upload = request.files.get('file')
+                if upload is None:
+                    return jsonify({'error': 'file is required'}), 400
+                stream = upload.stream
+                is_csv = upload.mimetype == 'text/csv' or (upload.filename or '').lower().endswith('.csv')
+            else:
+                stream = request.stream
+                is_csv = request.mimetype == 'text/csv'
+
+            import_format = request.args.get('format') or ('csv' if is_csv else 'ndjson')
+            if import_format not in FORMATS:
+                return jsonify({'error': f"format must be one of: {', '.join(FORMATS)}"}), 400
+
+            parse = parse_csv if import_format == 'csv' else parse_ndjson
+            result = import_todos(parse(stream))
+
+            if result['aborted']:
+                error, status = IMPORT_ABORT_ERRORS[result['aborted']]
+                return jsonify({**result, 'error': error}), status
+            return jsonify(result), 200
+
+        except (DataUnavailable, WriteOutcomeUnknown):
+            raise
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
 
     @app.route('/api/todos', methods=['POST'])
     def create_todo():
@@ -80,6 +203,11 @@ def register_routes(app):
                     error_response['debug_output'] = debug_output
                 return jsonify(error_response), 500
 
+        except (DataUnavailable, WriteOutcomeUnknown):
+            if is_debug_mode:
+                sys.stdout = old_stdout
+            raise
+
         except Exception as e:
             if is_debug_mode:
                 sys.stdout = old_stdout
@@ -128,6 +256,8 @@ def register_routes(app):
             else:
                 return jsonify({'error': 'Todo not found or update failed'}), 404
 
+        except (DataUnavailable, WriteOutcomeUnknown):
+            raise
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
@@ -141,6 +271,8 @@ def register_routes(app):
             else:
                 return jsonify({'error': 'Failed to delete todo'}), 500
 
+        except (DataUnavailable, WriteOutcomeUnknown):
+            raise
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
@@ -154,6 +286,8 @@ def register_routes(app):
             else:
                 return jsonify({'error': 'Todo not found'}), 404
 
+        except (DataUnavailable, WriteOutcomeUnknown):
+            raise
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
@@ -174,6 +308,72 @@ def register_routes(app):
             else:
                 return jsonify({'error': 'Failed to reorder todos'}), 500
 
+        except (DataUnavailable, WriteOutcomeUnknown):
+            raise
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/todos/archive', methods=['GET'])
+    def get_archived_todos():
+        """Get a page of archived todos (pass ``cursor`` from the previous page for the next one)."""
+        per_page = request.args.get('per_page', Config.ARCHIVE_PAGE_SIZE, type=int)
+        if per_page < 1:
+            return jsonify({'error': 'per_page must be positive'}), 400
+        per_page = min(per_page, Config.ARCHIVE_MAX_PAGE_SIZE)
+
+        cursor = None
+        if request.args.get('cursor'):
+            try:
+                cursor = _decode_cursor(request.args['cursor'])
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+
+        todos, next_cursor = TodoRepository.get_archived_todos(cursor=cursor, per_page=per_page)
+        return jsonify({
+            'items': [todo.to_dict() for todo in todos],
+            'per_page': per_page,
+            'next_cursor': _encode_cursor(next_cursor) if next_cursor else None
+        })
+
+    @app.route('/api/todos/archive', methods=['POST'])
+    def archive_todos():
+        """Move old completed todos into the archive."""
+        try:
+            data = request.get_json(silent=True) or {}
+            older_than_days = data.get('older_than_days', Config.ARCHIVE_AFTER_DAYS)
+            batch_size = data.get('batch_size', Config.ARCHIVE_BATCH_SIZE)
+
+            if not isinstance(older_than_days, int) or older_than_days < 0:
+                return jsonify({'error': 'older_than_days must be a non-negative integer'}), 400
+            if not isinstance(batch_size, int) or batch_size < 1:
+                return jsonify({'error': 'batch_size must be a positive integer'}), 400
+
+            archived = TodoRepository.archive_completed_todos(
+                older_than_days=older_than_days,
+                batch_size=batch_size
+            )
+            return jsonify({'archived': archived}), 200
+
+        except ArchiveIncomplete as e:
+            # Batches moved before the failure stay archived; rerunning continues from there
+            return jsonify({'error': str(e), 'archived': e.archived}), 503
+        except WriteOutcomeUnknown:
+            raise
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/todos/archive/<int:todo_id>/restore', methods=['POST'])
+    def restore_todo(todo_id):
+        """Restore an archived todo to the active list."""
+        try:
+            todo = TodoRepository.restore_todo(todo_id)
+            if todo:
+                return jsonify(todo.to_dict())
+            else:
+                return jsonify({'error': 'Archived todo not found'}), 404
+
+        except (DataUnavailable, WriteOutcomeUnknown):
+            raise
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
@@ -207,11 +407,8 @@ def register_routes(app):
 
     @app.route('/api/chatkit/create-session', methods=['POST'])
     def create_chatkit_session():
-        """Create a ChatKit session for AI assistant."""
+        """Create (or reuse a cached) ChatKit session for AI assistant."""
         try:
-            import os
-            import requests
-
             # ChatKit設定（環境変数から読み込む）
             workflow_id = os.environ.get('CHATKIT_WORKFLOW_ID') or os.environ.get('NEXT_PUBLIC_CHATKIT_WORKFLOW_ID')
             api_key = os.environ.get('OPENAI_API_KEY')
@@ -225,39 +422,27 @@ def register_routes(app):
 
             if not workflow_id:
                 return jsonify({'error': 'ChatKit workflow ID not configured'}), 500
-            
-            # OpenAI ChatKit APIを呼び出し
-            url = "https://api.openai.com/v1/chatkit/sessions"
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}",
-                "OpenAI-Beta": "chatkit_beta=v1"
-            }
-            
-            data = request.get_json() or {}
-            # ユニークなデバイスIDを生成（セッション管理用）
-            import time
-            device_id = data.get('device_id', f'todo_user_{int(time.time())}')
-
-            # ドキュメント通りのペイロード構造
-            payload = {
-                "workflow": {"id": workflow_id},
-                "user": device_id
-            }
 
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            data = request.get_json(silent=True) or {}
+            # デバイスIDが未指定の場合は新規に発行し、クライアントに保存してもらう
+            device_id = data.get('device_id') or generate_device_id()
+            if not isinstance(device_id, str) or len(device_id) > 128:
+                return jsonify({'error': 'Invalid device_id'}), 400
 
-            print(f"[ChatKit Session] Response status: {response.status_code}")
+            session = session_cache.get_or_create(
+                device_id,
+                lambda: create_upstream_session(device_id, workflow_id, api_key),
+                force_refresh=bool(data.get('refresh'))
+            )
+            return jsonify({**session, 'device_id': device_id}), 200
 
-            if response.status_code == 200:
-                return jsonify(response.json()), 200
-            else:
-                error_details = {
-                    'error': f'Failed to create session: {response.status_code}',
-                    'details': response.text
-                }
-                print(f"[ChatKit Session] Error: {error_details}")
-                return jsonify(error_details), response.status_code
+        except ChatKitSessionError as e:
+            error_details = {
+                'error': str(e),
+                'details': e.details
+            }
+            print(f"[ChatKit Session] Error: {error_details}")
+            return jsonify(error_details), e.status_code
 
         except Exception as e:
             import traceback
@@ -8,8 +8,31 @@ const CHATKIT_CONFIG = {
     CDN_URL: 'https://cdn.platform.openai.com/deployments/chatkit/chatkit.js',
     SESSION_ENDPOINT: '/api/chatkit/create-session',
     LOAD_TIMEOUT: 10000, // 10秒
+    DEVICE_ID_KEY: 'chatkit_device_id',
 };
 
+/**
+ * 保存済みのデバイスIDを取得（サーバー側のセッションキャッシュのキー）
+ */
+function getStoredDeviceId() {
+    try {
+        return localStorage.getItem(CHATKIT_CONFIG.DEVICE_ID_KEY);
+    } catch (e) {
+        return null;
+    }
+}
+
+/**
+ * サーバーが発行したデバイスIDを保存
+ */
+function storeDeviceId(deviceId) {
+    try {
+        localStorage.setItem(CHATKIT_CONFIG.DEVICE_ID_KEY, deviceId);
+    } catch (e) {
+        // プライベートモードなどで保存できない場合は毎回新しいIDになる
+    }
+}
+
 class ChatKitManager {
     constructor() {
         this.initialized = false;
@@ -165,7 +188,10 @@ class ChatKitManager {
                                 headers: {
                                     'Content-Type': 'application/json'
                                 },
-                                body: JSON.stringify(currentSecret ? { refresh: true } : {})
+                                body: JSON.stringify({
+                                    device_id: getStoredDeviceId() || undefined,
+                                    refresh: !!currentSecret
+                                })
                             });
 
                             if (!response.ok) {
@@ -181,6 +207,10 @@ class ChatKitManager {
                                 throw new Error('No client_secret in response');
                             }
 
+                            if (data.device_id) {
+                                storeDeviceId(data.device_id);
+                            }
+
                             console.log('✅ Got client_secret successfully');
 
                             // ローディングを非表示（少し遅延させる）
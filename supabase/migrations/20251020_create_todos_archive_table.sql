@@ -0,0 +1,67 @@
+-- 完了済みタスクのアーカイブテーブルを作成
+CREATE TABLE IF NOT EXISTS todos_archive (
+    id BIGINT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT,
+    completed BOOLEAN DEFAULT true,
+    priority TEXT DEFAULT 'medium',
+    "order" INTEGER DEFAULT 0,
+    created_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ,
+    archived_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- アーカイブ一覧のページング用インデックス
+CREATE INDEX IF NOT EXISTS idx_todos_archive_archived_at ON todos_archive (archived_at DESC, id DESC);
+
+-- アーカイブ対象（完了済み・古いもの）の抽出用インデックス
+CREATE INDEX IF NOT EXISTS idx_todos_completed_updated_at ON todos (updated_at, id) WHERE completed = true;
+
+-- 完了から一定期間経過したタスクを1バッチ分アーカイブへ移動し、移動件数を返す
+-- 削除と挿入を1文で行うため、途中で編集・未完了に戻されたタスクは移動されない
+CREATE OR REPLACE FUNCTION archive_completed_todos_batch(p_cutoff TIMESTAMPTZ, p_batch_size INTEGER)
+RETURNS INTEGER AS $$
+DECLARE
+    moved_count INTEGER;
+BEGIN
+    WITH batch AS (
+        SELECT id FROM todos
+        WHERE completed = true AND updated_at < p_cutoff
+        ORDER BY updated_at, id
+        LIMIT p_batch_size
+        FOR UPDATE SKIP LOCKED
+    ), moved AS (
+        DELETE FROM todos
+        USING batch
+        WHERE todos.id = batch.id
+        RETURNING todos.*
+    )
+    INSERT INTO todos_archive (id, title, description, completed, priority, "order", created_at, updated_at, archived_at)
+    SELECT id, title, description, completed, priority, "order", created_at, updated_at, NOW()
+    FROM moved;
+
+    GET DIAGNOSTICS moved_count = ROW_COUNT;
+    RETURN moved_count;
+END;
+$$ language 'plpgsql';
+
+-- アーカイブ済みタスクを1文でtodosへ戻し、復元した行を返す
+-- updated_atを現在時刻にして、次回のアーカイブ対象にならないようにする
+CREATE OR REPLACE FUNCTION restore_archived_todo(p_id BIGINT)
+RETURNS SETOF todos AS $$
+    WITH moved AS (
+        DELETE FROM todos_archive WHERE id = p_id RETURNING *
+    )
+    INSERT INTO todos (id, title, description, completed, priority, "order", created_at, updated_at)
+    SELECT id, title, description, completed, priority, "order", created_at, NOW()
+    FROM moved
+    RETURNING *;
+$$ language 'sql';
+
+-- Row Level Security (RLS)を有効化
+ALTER TABLE todos_archive ENABLE ROW LEVEL SECURITY;
+
+-- 全ユーザーに読み書き権限を付与（開発用）
+DROP POLICY IF EXISTS "Enable all access for todos_archive" ON todos_archive;
+CREATE POLICY "Enable all access for todos_archive" ON todos_archive
+    FOR ALL USING (true) WITH CHECK (true);
@@ -0,0 +1,84 @@
+-- ステータス・優先度ごとの件数を保持する集計テーブルを作成
+CREATE TABLE IF NOT EXISTS todo_stats (
+    completed BOOLEAN NOT NULL,
+    priority TEXT NOT NULL,
+    count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (completed, priority)
+);
+
+-- todosの変更に合わせて集計テーブルを差分更新するトリガー関数を作成
+-- 文単位トリガーの遷移テーブルを使うため、一括INSERT/DELETEでも集計行の更新は1文で済む
+CREATE OR REPLACE FUNCTION update_todo_stats()
+RETURNS TRIGGER
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO todo_stats (completed, priority, count)
+        SELECT COALESCE(completed, false), COALESCE(priority, 'medium'), COUNT(*)
+        FROM new_rows
+        GROUP BY 1, 2
+        ON CONFLICT (completed, priority) DO UPDATE SET count = todo_stats.count + EXCLUDED.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO todo_stats (completed, priority, count)
+        SELECT COALESCE(completed, false), COALESCE(priority, 'medium'), -COUNT(*)
+        FROM old_rows
+        GROUP BY 1, 2
+        ON CONFLICT (completed, priority) DO UPDATE SET count = todo_stats.count + EXCLUDED.count;
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- 完了状態・優先度が変わらない更新（並び替えなど）では集計行に触れない
+        INSERT INTO todo_stats (completed, priority, count)
+        SELECT completed, priority, SUM(delta)
+        FROM (
+            SELECT COALESCE(completed, false) AS completed, COALESCE(priority, 'medium') AS priority, -1 AS delta
+            FROM old_rows
+            UNION ALL
+            SELECT COALESCE(completed, false), COALESCE(priority, 'medium'), 1
+            FROM new_rows
+        ) changes
+        GROUP BY completed, priority
+        HAVING SUM(delta) <> 0
+        ON CONFLICT (completed, priority) DO UPDATE SET count = todo_stats.count + EXCLUDED.count;
+    ELSIF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM todo_stats;
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- トリガーを作成
+DROP TRIGGER IF EXISTS update_todo_stats_on_insert ON todos;
+CREATE TRIGGER update_todo_stats_on_insert AFTER INSERT ON todos
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_todo_stats();
+
+DROP TRIGGER IF EXISTS update_todo_stats_on_update ON todos;
+CREATE TRIGGER update_todo_stats_on_update AFTER UPDATE ON todos
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_todo_stats();
+
+DROP TRIGGER IF EXISTS update_todo_stats_on_delete ON todos;
+CREATE TRIGGER update_todo_stats_on_delete AFTER DELETE ON todos
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_todo_stats();
+
+DROP TRIGGER IF EXISTS update_todo_stats_on_truncate ON todos;
+CREATE TRIGGER update_todo_stats_on_truncate AFTER TRUNCATE ON todos
+    FOR EACH STATEMENT EXECUTE FUNCTION update_todo_stats();
+
+-- 既存データから集計値を再計算
+LOCK TABLE todos IN SHARE MODE;
+DELETE FROM todo_stats;
+INSERT INTO todo_stats (completed, priority, count)
+SELECT COALESCE(completed, false), COALESCE(priority, 'medium'), COUNT(*)
+FROM todos
+GROUP BY 1, 2;
+
+-- Row Level Security (RLS)を有効化
+ALTER TABLE todo_stats ENABLE ROW LEVEL SECURITY;
+
+-- 集計テーブルは読み取りのみ許可（更新はトリガー経由）
+DROP POLICY IF EXISTS "Enable read access for todo_stats" ON todo_stats;
+CREATE POLICY "Enable read access for todo_stats" ON todo_stats
+    FOR SELECT USING (true);
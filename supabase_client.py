@@ -1,6 +1,7 @@
 """Supabase client configuration."""
 import os
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
+from config import Config
 
 # Load environment variables from .env file (only in local development)
 try:
@@ -30,7 +31,11 @@ def get_supabase_client() -> Client:
             raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set")
 
         try:
-            _client_cache = create_client(SUPABASE_URL, SUPABASE_KEY)
+            # Keep the HTTP timeout within the deadlines so abandoned calls free their thread
+            options = ClientOptions(
+                postgrest_client_timeout=min(Config.SUPABASE_READ_DEADLINE, Config.SUPABASE_WRITE_DEADLINE)
+            )
+            _client_cache = create_client(SUPABASE_URL, SUPABASE_KEY, options=options)
             print(f"[DEBUG] Supabase client created successfully")
         except Exception as e:
             print(f"[ERROR] Failed to create Supabase client: {type(e).__name__}: {e}")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Test CSS minification, asset serving and response compression."""
+import gzip
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from flask import Flask, Response, jsonify
+
+import compression
+from assets import register_assets
+from build_assets import build_assets, minify_css
+from compression import register_compression
+from config import Config
+
+
+@contextmanager
+def built_assets():
+    """Build the assets into a temporary dist directory and point Config at it."""
+    saved_dist_dir = Config.ASSET_DIST_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        Config.ASSET_DIST_DIR = Path(tmp) / 'dist'
+        try:
+            yield build_assets()
+        finally:
+            Config.ASSET_DIST_DIR = saved_dist_dir
+
+
+def compression_client():
+    """Test client for an app with JSON responses either side of COMPRESS_MIN_SIZE."""
+    app = Flask(__name__)
+
+    @app.route('/large')
+    def large():
+        return jsonify(items=['todo'] * Config.COMPRESS_MIN_SIZE)
+
+    @app.route('/small')
+    def small():
+        return jsonify(items=['todo'])
+
+    @app.route('/streamed')
+    def streamed():
+        return Response((f'{{"n": {n}}}\n' for n in range(Config.COMPRESS_MIN_SIZE)),
+                        mimetype='application/json')
+
+    register_compression(app)
+    return app.test_client()
+
+
+def test_minify_css_strips_comments_and_whitespace():
+    """Comments and redundant whitespace are removed."""
+    css = """
+    /* header */
+    .a ,  .b {
+        color:  red ;
+        margin: 0;
+    }
+    .c/* between */.d { }
+    """
+    assert minify_css(css) == '.a,.b{color:red;margin:0}.c .d{}'
+
+
+def test_minify_css_keeps_quoted_strings():
+    """Text inside quotes, including comment markers and spacing, is left alone."""
+    css = """.a::before { content: "/* not a comment */  ;  { }"; }
+    .b { background: url('img/a  b.png'); font-family: "Noto Sans", sans-serif; }
+    .c::after { content: "say \\"hi\\"  /*"; } /* real */"""
+    assert minify_css(css) == (
+        '.a::before{content:"/* not a comment */  ;  { }"}'
+        ".b{background:url('img/a  b.png');font-family:\"Noto Sans\",sans-serif}"
+        '.c::after{content:"say \\"hi\\"  /*"}'
+    )
+
+
+def test_response_compressed_when_accepted():
+    """Large JSON is compressed with the negotiated encoding and marked Vary."""
+    client = compression_client()
+
+    response = client.get('/large', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.vary
+    assert gzip.decompress(response.data) == client.get('/large').data
+
+    response = client.get('/large', headers={'Accept-Encoding': 'br, gzip'})
+    assert response.headers['Content-Encoding'] == ('br' if compression.brotli else 'gzip')
+
+
+def test_response_not_compressed():
+    """Uncompressed responses still carry Vary so caches keep the variants apart."""
+    client = compression_client()
+
+    response = client.get('/large')
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.vary
+
+    response = client.get('/small', headers={'Accept-Encoding': 'gzip'})
+    assert len(response.data) < Config.COMPRESS_MIN_SIZE
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.vary
+
+
+def test_streamed_response_not_compressed():
+    """Streamed bodies are passed through instead of being buffered to compress."""
+    client = compression_client()
+    response = client.get('/streamed', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.data.startswith(b'{"n": 0}\n')
+
+
+def test_built_asset_served():
+    """Fingerprinted files are served immutable, precompressed when accepted."""
+    with built_assets() as manifest:
+        app = Flask(__name__)
+        register_assets(app)
+        client = app.test_client()
+        built = manifest['css/style.css']['file']
+
+        plain = client.get(f'/assets/{built}')
+        assert plain.status_code == 200
+        assert 'Content-Encoding' not in plain.headers
+        assert plain.cache_control.immutable
+        assert 'Accept-Encoding' in plain.vary
+
+        compressed = client.get(f'/assets/{built}', headers={'Accept-Encoding': 'gzip'})
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(compressed.data) == plain.data
+        plain.close()
+        compressed.close()
+
+        with app.test_request_context():
+            assert app.jinja_env.globals['asset_url']('css/style.css') == f'/assets/{built}'
+
+
+def test_unlisted_files_not_served():
+    """Only files named in the manifest are reachable under /assets."""
+    with built_assets() as manifest:
+        app = Flask(__name__)
+        register_assets(app)
+        client = app.test_client()
+        built = manifest['css/style.css']['file']
+
+        assert client.get('/assets/manifest.json').status_code == 404
+        assert client.get(f'/assets/{built}.gz').status_code == 404
+        assert client.get('/assets/css/missing.css').status_code == 404
+        assert client.get('/assets/../config.py').status_code == 404
+
+
+if __name__ == "__main__":
+    print("=== Assets Test ===")
+    for test in (test_minify_css_strips_comments_and_whitespace, test_minify_css_keeps_quoted_strings,
+                 test_response_compressed_when_accepted, test_response_not_compressed,
+                 test_streamed_response_not_compressed, test_built_asset_served,
+                 test_unlisted_files_not_served):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Test ChatKit session caching against the local sessions API stub."""
+import os
+import threading
+from contextlib import contextmanager
+
+from werkzeug.serving import make_server
+
+from chatkit_stub import create_stub_app
+from config import Config
+
+STUB_ENV = {'OPENAI_API_KEY': 'sk-test', 'CHATKIT_WORKFLOW_ID': 'wf_test'}
+
+
+@contextmanager
+def running_stub(**kwargs):
+    """Run the stub on a free port and point the app at it.
+
+    The API base and credentials are restored on exit, so nothing leaks into
+    other tests or a developer's real ChatKit settings.
+    """
+    stub = create_stub_app(**kwargs)
+    server = make_server('127.0.0.1', 0, stub, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    saved_base = Config.CHATKIT_API_BASE
+    saved_env = {name: os.environ.get(name) for name in STUB_ENV}
+    Config.CHATKIT_API_BASE = f'http://127.0.0.1:{server.server_port}/v1'
+    os.environ.update(STUB_ENV)
+    try:
+        yield stub
+    finally:
+        server.shutdown()
+        Config.CHATKIT_API_BASE = saved_base
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def new_client():
+    """Flask test client with an empty session cache."""
+    import chatkit_sessions
+    from app import app
+
+    chatkit_sessions.session_cache.clear()
+    return app.test_client()
+
+
+def test_session_reused_per_device():
+    """Repeated opens on the same device share one upstream session."""
+    with running_stub() as stub:
+        client = new_client()
+        first = client.post('/api/chatkit/create-session', json={'device_id': 'device-a'}).get_json()
+        second = client.post('/api/chatkit/create-session', json={'device_id': 'device-a'}).get_json()
+        other = client.post('/api/chatkit/create-session', json={'device_id': 'device-b'}).get_json()
+
+        assert first['client_secret'] == second['client_secret']
+        assert other['client_secret'] != first['client_secret']
+        assert stub.config['SESSIONS_CREATED'] == 2
+
+
+def test_device_id_issued_when_missing():
+    """A device id is generated and returned when the client sends none."""
+    with running_stub() as stub:
+        client = new_client()
+        data = client.post('/api/chatkit/create-session', json={}).get_json()
+        assert data['device_id'].startswith('todo_user_')
+
+        again = client.post('/api/chatkit/create-session', json={'device_id': data['device_id']}).get_json()
+        assert again['client_secret'] == data['client_secret']
+        assert stub.config['SESSIONS_CREATED'] == 1
+
+
+def test_refresh_requested_by_client():
+    """A refresh request replaces the cached session."""
+    with running_stub() as stub:
+        client = new_client()
+        first = client.post('/api/chatkit/create-session', json={'device_id': 'device-a'}).get_json()
+        refreshed = client.post('/api/chatkit/create-session',
+                                json={'device_id': 'device-a', 'refresh': True}).get_json()
+        again = client.post('/api/chatkit/create-session', json={'device_id': 'device-a'}).get_json()
+
+        assert refreshed['client_secret'] != first['client_secret']
+        assert again['client_secret'] == refreshed['client_secret']
+        assert stub.config['SESSIONS_CREATED'] == 2
+
+
+def test_session_near_expiry_not_reused():
+    """Sessions inside the refresh margin are replaced."""
+    with running_stub(session_ttl=Config.CHATKIT_SESSION_REFRESH_MARGIN - 1) as stub:
+        client = new_client()
+        first = client.post('/api/chatkit/create-session', json={'device_id': 'device-a'}).get_json()
+        second = client.post('/api/chatkit/create-session', json={'device_id': 'device-a'}).get_json()
+
+        assert first['client_secret'] != second['client_secret']
+        assert stub.config['SESSIONS_CREATED'] == 2
+
+
+def test_concurrent_requests_collapsed():
+    """Concurrent opens on one device make a single upstream call."""
+    with running_stub(delay=0.3) as stub:
+        from app import app
+        new_client()
+        secrets = []
+
+        def open_widget():
+            with app.test_client() as client:
+                data = client.post('/api/chatkit/create-session', json={'device_id': 'device-a'}).get_json()
+                secrets.append(data['client_secret'])
+
+        threads = [threading.Thread(target=open_widget) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(secrets)) == 1
+        assert stub.config['SESSIONS_CREATED'] == 1
+
+
+def test_stub_settings_restored():
+    """The API base and credentials are put back once the stub stops."""
+    saved_base = Config.CHATKIT_API_BASE
+    saved_env = {name: os.environ.get(name) for name in STUB_ENV}
+    with running_stub():
+        assert Config.CHATKIT_API_BASE != saved_base
+    assert Config.CHATKIT_API_BASE == saved_base
+    assert {name: os.environ.get(name) for name in STUB_ENV} == saved_env
+
+
+if __name__ == "__main__":
+    print("=== ChatKit Session Cache Test ===")
+    for test in (test_session_reused_per_device, test_device_id_issued_when_missing,
+                 test_refresh_requested_by_client, test_session_near_expiry_not_reused,
+                 test_concurrent_requests_collapsed, test_stub_settings_restored):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""Test deadlines, retries and hedged reads in resilience.py."""
+import threading
+import time
+
+import httpx
+from postgrest.exceptions import APIError
+
+import resilience
+from config import Config
+from resilience import DeadlineExceeded, backoff_delay, call_with_deadline, is_transient, resilient_read
+
+
+class FlakyRead:
+    """Callable that fails ``failures`` times, then returns ``result``.
+
+    Failures are connection errors unless ``error`` builds something else.
+    """
+
+    def __init__(self, failures: int, result='ok', error=None):
+        self.failures = failures
+        self.result = result
+        self.error = error or (lambda n: httpx.ConnectError(f'blip {n}'))
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+            call_number = self.calls
+        if call_number <= self.failures:
+            raise self.error(call_number)
+        return self.result
+
+
+def record_sleeps():
+    """Replace the backoff sleep with one that records delays; returns the list."""
+    sleeps = []
+    resilience._sleep = sleeps.append
+    return sleeps
+
+
+def restore_sleep():
+    resilience._sleep = time.sleep
+
+
+def test_hedge_wins_over_slow_primary():
+    """A slow first read is beaten by the hedged duplicate."""
+    calls = []
+
+    def read():
+        calls.append(None)
+        if len(calls) == 1:
+            time.sleep(1.0)
+            return 'primary'
+        return 'hedge'
+
+    started = time.monotonic()
+    result = resilient_read(read, deadline=2.0, attempts=1, hedge_after=0.05)
+
+    assert result == 'hedge'
+    assert len(calls) == 2
+    assert time.monotonic() - started < 0.5
+
+
+def test_no_hedge_when_primary_is_fast():
+    """No duplicate is started if the first read answers before hedge_after."""
+    read = FlakyRead(failures=0)
+    assert resilient_read(read, deadline=1.0, attempts=1, hedge_after=0.5) == 'ok'
+    time.sleep(0.6)
+    assert read.calls == 1
+
+
+def test_retry_until_success():
+    """Transient failures are retried with a backoff sleep between attempts."""
+    sleeps = record_sleeps()
+    try:
+        read = FlakyRead(failures=2)
+        assert resilient_read(read, deadline=1.0, attempts=3) == 'ok'
+        assert read.calls == 3
+        assert len(sleeps) == 2
+    finally:
+        restore_sleep()
+
+
+def test_all_attempts_fail():
+    """The last error is raised once every attempt has failed."""
+    sleeps = record_sleeps()
+    try:
+        read = FlakyRead(failures=10)
+        try:
+            resilient_read(read, deadline=1.0, attempts=3)
+        except httpx.ConnectError as e:
+            assert str(e) == 'blip 3'
+        else:
+            raise AssertionError('expected ConnectError')
+        assert read.calls == 3
+        assert len(sleeps) == 2
+    finally:
+        restore_sleep()
+
+
+def test_all_attempts_fail_with_hedging():
+    """With hedging, each attempt fails only after every copy has failed."""
+    sleeps = record_sleeps()
+    try:
+        def read():
+            time.sleep(0.1)
+            raise httpx.ConnectError('down')
+
+        try:
+            resilient_read(read, deadline=1.0, attempts=2, hedge_after=0.05)
+        except httpx.ConnectError as e:
+            assert str(e) == 'down'
+        else:
+            raise AssertionError('expected ConnectError')
+        assert len(sleeps) == 1
+    finally:
+        restore_sleep()
+
+
+def test_permanent_error_not_retried():
+    """Errors that would fail the same way again are raised on the first attempt."""
+    sleeps = record_sleeps()
+    try:
+        for error in (lambda n: APIError({'code': '42501', 'message': 'permission denied'}),
+                      lambda n: APIError({'code': 400, 'message': 'JSON could not be generated'}),
+                      lambda n: KeyError('id')):
+            read = FlakyRead(failures=10, error=error)
+            try:
+                resilient_read(read, deadline=1.0, attempts=3)
+            except (APIError, KeyError):
+                pass
+            else:
+                raise AssertionError('expected the error to be raised')
+            assert read.calls == 1
+        assert sleeps == []
+    finally:
+        restore_sleep()
+
+
+def test_transient_errors():
+    """Deadlines, transport failures and server-side 5xx errors are retried."""
+    assert is_transient(DeadlineExceeded('slow'))
+    assert is_transient(httpx.ConnectError('refused'))
+    assert is_transient(httpx.ReadTimeout('slow'))
+    assert is_transient(APIError({'code': 503, 'message': 'JSON could not be generated'}))
+    assert is_transient(APIError({'code': '57014', 'message': 'canceling statement due to statement timeout'}))
+    assert is_transient(APIError({'code': 'PGRST003', 'message': 'Timed out acquiring connection'}))
+    assert not is_transient(APIError({'code': 404, 'message': 'JSON could not be generated'}))
+    assert not is_transient(APIError({'code': '23505', 'message': 'duplicate key'}))
+    assert not is_transient(APIError({'code': 'PGRST116', 'message': 'no rows'}))
+    assert not is_transient(ValueError('bad row'))
+
+
+def test_deadline_exceeded():
+    """A read slower than its deadline raises DeadlineExceeded on time."""
+    started = time.monotonic()
+    try:
+        resilient_read(lambda: time.sleep(1.0), deadline=0.1, attempts=1)
+    except DeadlineExceeded:
+        pass
+    else:
+        raise AssertionError('expected DeadlineExceeded')
+    assert time.monotonic() - started < 0.5
+
+
+def test_write_deadline_exceeded():
+    """call_with_deadline gives up on a slow call without waiting for it."""
+    started = time.monotonic()
+    try:
+        call_with_deadline(lambda: time.sleep(1.0), deadline=0.1)
+    except DeadlineExceeded:
+        pass
+    else:
+        raise AssertionError('expected DeadlineExceeded')
+    assert time.monotonic() - started < 0.5
+
+
+def test_queue_time_not_counted_against_deadline():
+    """A call waiting for a free worker still gets its full deadline once it runs."""
+    blockers = [resilience._executor.submit(time.sleep, 0.15) for _ in range(Config.SUPABASE_MAX_WORKERS)]
+    try:
+        def read():
+            time.sleep(0.1)
+            return 'done'
+
+        assert call_with_deadline(read, deadline=0.2) == 'done'
+    finally:
+        for blocker in blockers:
+            blocker.result()
+
+
+def test_queue_wait_bounded():
+    """A call that cannot get a worker within its deadline fails and never runs."""
+    blockers = [resilience._executor.submit(time.sleep, 0.5) for _ in range(Config.SUPABASE_MAX_WORKERS)]
+    calls = []
+    try:
+        started = time.monotonic()
+        try:
+            call_with_deadline(lambda: calls.append(None), deadline=0.1)
+        except DeadlineExceeded:
+            pass
+        else:
+            raise AssertionError('expected DeadlineExceeded')
+        assert time.monotonic() - started < 0.3
+    finally:
+        for blocker in blockers:
+            blocker.result()
+    time.sleep(0.05)
+    assert calls == []
+
+
+def test_backoff_bounds():
+    """Backoff grows exponentially from the base delay and is capped."""
+    for attempt in range(10):
+        cap = min(Config.SUPABASE_RETRY_MAX_DELAY, Config.SUPABASE_RETRY_BASE_DELAY * (2 ** attempt))
+        for _ in range(50):
+            assert 0 <= backoff_delay(attempt) <= cap
+    assert max(backoff_delay(20) for _ in range(200)) <= Config.SUPABASE_RETRY_MAX_DELAY
+
+
+if __name__ == "__main__":
+    print("=== Resilience Test ===")
+    for test in (test_hedge_wins_over_slow_primary, test_no_hedge_when_primary_is_fast,
+                 test_retry_until_success, test_all_attempts_fail, test_all_attempts_fail_with_hedging,
+                 test_permanent_error_not_retried, test_transient_errors,
+                 test_deadline_exceeded, test_write_deadline_exceeded,
+                 test_queue_time_not_counted_against_deadline, test_queue_wait_bounded,
+                 test_backoff_bounds):
+        test()
+        print(f"✅ {test.__name__}")
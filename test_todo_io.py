@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Test NDJSON/CSV parsing, row validation and batched import in todo_io.py."""
+import csv
+import io
+
+from models import TodoRepository, WriteOutcomeUnknown
+from todo_io import import_todos, parse_csv, parse_ndjson, validate_row
+
+
+def stream(text):
+    """Binary upload stream for ``text`` (bytes are passed through)."""
+    return io.BytesIO(text if isinstance(text, bytes) else text.encode('utf-8'))
+
+
+def expect_value_error(row, message):
+    try:
+        validate_row(row)
+    except ValueError as e:
+        assert message in str(e), str(e)
+    else:
+        raise AssertionError(f'expected ValueError for {row!r}')
+
+
+class FakeRepository:
+    """Stands in for TodoRepository's bulk methods while a test runs."""
+
+    def __init__(self, max_order=0, fail_batch=None, timeout_batch=None):
+        self.max_order = max_order
+        self.fail_batch = fail_batch
+        self.timeout_batch = timeout_batch
+        self.batches = []
+
+    def get_max_order(self):
+        return self.max_order
+
+    def insert_todos(self, rows):
+        batch_number = len(self.batches) + 1
+        if batch_number == self.timeout_batch:
+            raise WriteOutcomeUnknown('timed out')
+        if batch_number == self.fail_batch:
+            return 0
+        self.batches.append([dict(row) for row in rows])
+        return len(rows)
+
+    def __enter__(self):
+        self.saved = TodoRepository.get_max_order, TodoRepository.insert_todos
+        TodoRepository.get_max_order = staticmethod(self.get_max_order)
+        TodoRepository.insert_todos = staticmethod(self.insert_todos)
+        return self
+
+    def __exit__(self, *exc):
+        TodoRepository.get_max_order, TodoRepository.insert_todos = (
+            staticmethod(self.saved[0]), staticmethod(self.saved[1])
+        )
+
+
+def test_ndjson_line_numbers():
+    """NDJSON rows keep their physical line numbers; blank lines are skipped."""
+    rows = list(parse_ndjson(stream('{"title": "a"}\n\n{bad\n{"title": "b"}\n')))
+
+    assert [line for line, _ in rows] == [1, 3, 4]
+    assert rows[0][1] == {'title': 'a'}
+    assert isinstance(rows[1][1], ValueError)
+
+
+def test_csv_line_numbers():
+    """CSV line numbers count the header and quoted newlines."""
+    text = 'title,description\na,one\n"b","two\nlines"\nc,three\n'
+    rows = list(parse_csv(stream(text)))
+
+    assert [row['title'] for _, row in rows] == ['a', 'b', 'c']
+    assert [line for line, _ in rows] == [2, 4, 5]
+
+
+def test_utf8_bom_accepted():
+    """A UTF-8 byte order mark does not end up in the first field name."""
+    rows = list(parse_csv(stream('\ufefftitle\na\n')))
+    assert rows[0][1] == {'title': 'a'}
+
+
+def test_bad_utf8_raises():
+    """Non-UTF-8 uploads fail to parse instead of producing garbled titles."""
+    for parse in (parse_ndjson, parse_csv):
+        try:
+            list(parse(stream(b'title\n\xff\xfe\n')))
+        except UnicodeDecodeError:
+            pass
+        else:
+            raise AssertionError(f'{parse.__name__} accepted invalid UTF-8')
+
+
+def test_boolean_parsing():
+    """Completed accepts JSON booleans and the usual CSV spellings only."""
+    for value, expected in [(True, True), (False, False), (None, False),
+                            ('true', True), ('TRUE', True), ('1', True), ('yes', True),
+                            ('false', False), ('0', False), ('no', False), ('', False), (' True ', True)]:
+        assert validate_row({'title': 't', 'completed': value})['completed'] is expected, value
+
+    for value in ('maybe', 2, 1, 0, [], 'y'):
+        expect_value_error({'title': 't', 'completed': value}, 'Completed')
+
+
+def test_row_validation():
+    """Titles are required and trimmed, priority must be known, defaults apply."""
+    assert validate_row({'title': '  task  '}) == {
+        'title': 'task', 'description': '', 'priority': 'medium', 'completed': False
+    }
+    assert validate_row({'title': 't', 'priority': '', 'description': None})['priority'] == 'medium'
+
+    expect_value_error({'title': '   '}, 'Title')
+    expect_value_error({'title': 5}, 'Title')
+    expect_value_error({}, 'Title')
+    expect_value_error({'title': 't', 'priority': 'urgent'}, 'Priority')
+    expect_value_error({'title': 't', 'description': 3}, 'Description')
+    expect_value_error(['t'], 'object')
+    expect_value_error(ValueError('Invalid JSON: x'), 'Invalid JSON')
+
+
+def test_import_batches_and_order():
+    """Rows are inserted in fixed-size batches with order continuing from the max."""
+    rows = parse_ndjson(stream(''.join(f'{{"title": "t{i}"}}\n' for i in range(5)) + '{"title": ""}\n'))
+    with FakeRepository(max_order=10) as repository:
+        result = import_todos(rows, batch_size=2)
+
+    assert [len(batch) for batch in repository.batches] == [2, 2, 1]
+    assert [row['order'] for batch in repository.batches for row in batch] == [11, 12, 13, 14, 15]
+    assert result == {'imported': 5, 'error_count': 1, 'aborted': None,
+                      'errors': [{'line': 6, 'error': 'Title is required'}]}
+
+
+def test_import_stops_on_failed_batch():
+    """A failed batch stops the import and reports what was imported."""
+    rows = parse_ndjson(stream(''.join(f'{{"title": "t{i}"}}\n' for i in range(6))))
+    with FakeRepository(fail_batch=2) as repository:
+        result = import_todos(rows, batch_size=2)
+
+    assert len(repository.batches) == 1
+    assert result['imported'] == 2
+    assert result['aborted'] == 'insert_failed'
+
+
+def test_import_reports_unknown_outcome():
+    """A timed-out batch is reported as outcome unknown, not as a failure."""
+    rows = parse_ndjson(stream('{"title": "a"}\n'))
+    with FakeRepository(timeout_batch=1):
+        result = import_todos(rows, batch_size=2)
+
+    assert result['imported'] == 0
+    assert result['aborted'] == 'outcome_unknown'
+
+
+def test_import_stops_on_bad_utf8():
+    """Rows before invalid UTF-8 are kept; the import reports the encoding problem."""
+    data = b'{"title": "a"}\n{"title": "b"}\n' + b'\xff' * 10000
+    with FakeRepository() as repository:
+        result = import_todos(parse_ndjson(stream(data)), batch_size=1)
+
+    assert result['aborted'] == 'invalid_encoding'
+    assert result['imported'] == sum(len(batch) for batch in repository.batches)
+
+
+def test_import_stops_on_bad_csv():
+    """Rows before unparseable CSV are kept; the import reports the CSV problem."""
+    data = 'title\na\nb\n"' + 'x' * (csv.field_size_limit() + 1) + '"\nc\n'
+    with FakeRepository() as repository:
+        result = import_todos(parse_csv(stream(data)), batch_size=1)
+
+    assert result['aborted'] == 'invalid_csv'
+    assert result['imported'] == 2
+    assert [batch[0]['title'] for batch in repository.batches] == ['a', 'b']
+
+
+if __name__ == "__main__":
+    print("=== Todo Import/Export Test ===")
+    for test in (test_ndjson_line_numbers, test_csv_line_numbers, test_utf8_bom_accepted,
+                 test_bad_utf8_raises, test_boolean_parsing, test_row_validation,
+                 test_import_batches_and_order, test_import_stops_on_failed_batch,
+                 test_import_reports_unknown_outcome, test_import_stops_on_bad_utf8,
+                 test_import_stops_on_bad_csv):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,153 @@
+"""Streaming import and export of todos as NDJSON or CSV."""
+import csv
+import io
+import json
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Tuple
+
+from config import Config
+from models import PRIORITIES, Todo, TodoRepository, WriteOutcomeUnknown
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+EXPORT_FIELDS = ['id', 'title', 'description', 'completed', 'priority', 'order', 'created_at', 'updated_at']
+
+_TRUE_VALUES = {'true', '1', 'yes'}
+_FALSE_VALUES = {'false', '0', 'no', ''}
+
+
+def export_ndjson(todos: Iterable[Todo]) -> Iterator[str]:
+    """Yield one JSON object per line."""
+    for todo in todos:
+        yield json.dumps(todo.to_dict(), ensure_ascii=False) + '\n'
+
+
+def export_csv(todos: Iterable[Todo]) -> Iterator[str]:
+    """Yield a header line followed by one CSV line per todo."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction='ignore')
+    writer.writeheader()
+    for todo in todos:
+        writer.writerow(todo.to_dict())
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only when there are no todos
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def parse_ndjson(stream: BinaryIO) -> Iterator[Tuple[int, Any]]:
+    """Yield ``(line_number, row)`` for each non-blank line; invalid JSON yields the error."""
+    for line_number, line in enumerate(io.TextIOWrapper(stream, encoding='utf-8-sig'), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, ValueError(f'Invalid JSON: {e}')
+
+
+def parse_csv(stream: BinaryIO) -> Iterator[Tuple[int, Any]]:
+    """Yield ``(line_number, row)`` for each CSV record after the header."""
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    for row in reader:
+        yield reader.line_num, row
+
+
+def validate_row(row: Any) -> Dict[str, Any]:
+    """Convert an uploaded row into insertable todo data or raise ValueError."""
+    if isinstance(row, Exception):
+        raise row
+    if not isinstance(row, dict):
+        raise ValueError('Row must be an object')
+
+    title = row.get('title')
+    if not isinstance(title, str) or not title.strip():
+        raise ValueError('Title is required')
+
+    description = row.get('description') or ''
+    if not isinstance(description, str):
+        raise ValueError('Description must be a string')
+
+    priority = row.get('priority') or 'medium'
+    if priority not in PRIORITIES:
+        raise ValueError(f"Priority must be one of: {', '.join(PRIORITIES)}")
+
+    completed = row.get('completed', False)
+    if isinstance(completed, str):
+        # CSV cells are always strings
+        value = completed.strip().lower()
+        if value not in _TRUE_VALUES | _FALSE_VALUES:
+            raise ValueError('Completed must be true or false')
+        completed = value in _TRUE_VALUES
+    elif completed is None:
+        completed = False
+    elif not isinstance(completed, bool):
+        raise ValueError('Completed must be true or false')
+
+    return {
+        'title': title.strip(),
+        'description': description,
+        'priority': priority,
+        'completed': completed
+    }
+
+
+def import_todos(rows: Iterable[Tuple[int, Any]], batch_size: int = None) -> Dict[str, Any]:
+    """Validate rows and insert them in fixed-size batches.
+
+    ``order`` values continue from the current maximum in file order. Each
+    batch is inserted before more input is read, so memory use is bounded by
+    the batch size regardless of upload size. Invalid rows are skipped and
+    reported. Importing stops early, with ``aborted`` set to the reason, if
+    the upload is not UTF-8 (``'invalid_encoding'``), the CSV cannot be parsed
+    (``'invalid_csv'``), a batch fails to insert (``'insert_failed'``) or a
+    batch insert times out (``'outcome_unknown'``).
+    """
+    batch_size = batch_size or Config.IMPORT_BATCH_SIZE
+    next_order = TodoRepository.get_max_order() + 1
+    result = {'imported': 0, 'error_count': 0, 'errors': [], 'aborted': None}
+    batch = []
+
+    def flush() -> bool:
+        try:
+            inserted = TodoRepository.insert_todos(batch)
+        except WriteOutcomeUnknown:
+            result['aborted'] = 'outcome_unknown'
+            return False
+        result['imported'] += inserted
+        batch.clear()
+        if not inserted:
+            result['aborted'] = 'insert_failed'
+        return inserted > 0
+
+    try:
+        for line_number, row in rows:
+            try:
+                todo_data = validate_row(row)
+            except ValueError as e:
+                result['error_count'] += 1
+                if len(result['errors']) < Config.IMPORT_MAX_REPORTED_ERRORS:
+                    result['errors'].append({'line': line_number, 'error': str(e)})
+                continue
+
+            todo_data['order'] = next_order
+            next_order += 1
+            batch.append(todo_data)
+
+            if len(batch) >= batch_size and not flush():
+                return result
+    except UnicodeDecodeError:
+        result['aborted'] = 'invalid_encoding'
+        return result
+    except csv.Error:
+        # e.g. a field over csv.field_size_limit(); the reader cannot resync after it
+        result['aborted'] = 'invalid_csv'
+        return result
+
+    if batch:
+        flush()
+    return result